@@ -1,58 +1,135 @@
 """Dashboard statistics endpoints."""
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
+from app.core.singleflight import CoalescingCache, canonical_key
+from app.db.changelog import get_change_log
+from app.db.mock_data import get_countries, get_region_data
+from app.db.rollup import get_rollup, LEVELS, ROOT
 
 router = APIRouter()
 
-REGIONS = [
-    {"id": "east", "name": "East Africa", "countries": ["Tanzania", "Kenya", "Uganda", "Rwanda", "Ethiopia"], "color": "#3b82f6", "stats": {"totalCases": 30400000, "avgResistance": 23.5, "surveillanceSites": 45}},
-    {"id": "west", "name": "West Africa", "countries": ["Nigeria", "Ghana", "Mali", "Burkina Faso", "Senegal"], "color": "#10b981", "stats": {"totalCases": 85000000, "avgResistance": 18.2, "surveillanceSites": 52}},
-    {"id": "central", "name": "Central Africa", "countries": ["DRC", "Cameroon", "CAR", "Congo"], "color": "#f59e0b", "stats": {"totalCases": 38000000, "avgResistance": 28.7, "surveillanceSites": 23}},
-    {"id": "south", "name": "Southern Africa", "countries": ["Mozambique", "South Africa", "Malawi", "Zimbabwe", "Zambia"], "color": "#8b5cf6", "stats": {"totalCases": 18000000, "avgResistance": 15.8, "surveillanceSites": 38}}
-]
-
-TREND_DATA = [
-    {"year": 2019, "resistance": 12.5, "efficacy": 96.8},
-    {"year": 2020, "resistance": 14.2, "efficacy": 96.2},
-    {"year": 2021, "resistance": 16.8, "efficacy": 95.5},
-    {"year": 2022, "resistance": 19.5, "efficacy": 94.8},
-    {"year": 2023, "resistance": 22.3, "efficacy": 93.9}
-]
-
-DASHBOARD_STATS = {
-    "totalCountries": 19,
-    "highResistanceCount": 4,
-    "avgEfficacy": 92.8,
-    "activeSurveillance": 163,
-    "trendData": TREND_DATA,
-    "regionData": [
-        {"region": "East Africa", "cases": 30400000, "resistance": 23.5},
-        {"region": "West Africa", "cases": 85000000, "resistance": 18.2},
-        {"region": "Central Africa", "cases": 38000000, "resistance": 28.7},
-        {"region": "Southern Africa", "cases": 18000000, "resistance": 15.8}
-    ],
-    "markerDistribution": [
-        {"marker": "Pfkelch13", "prevalence": 8.5},
-        {"marker": "Pfcrt", "prevalence": 25.3},
-        {"marker": "Pfmdr1", "prevalence": 18.7},
-        {"marker": "Pfdhfr", "prevalence": 45.2},
-        {"marker": "Pfdhps", "prevalence": 32.8}
+# Fresh for a minute, then served stale for up to five more while one request refreshes it
+stats_cache = CoalescingCache("dashboard_stats", ttl=60, stale_ttl=300)
+
+MARKER_GENES = ["Pfkelch13", "Pfcrt", "Pfmdr1", "Pfdhfr", "Pfdhps"]
+
+
+def compute_regions(year_start: Optional[int] = None, year_end: Optional[int] = None):
+    """Region cards with stats rolled up from surveillance sites (latest year by default).
+
+    ``totalCases`` is the national 2023 case burden of the region's countries;
+    ``catchmentCases`` counts only cases within surveillance site catchments
+    over the requested window.
+    """
+    rollup = get_rollup()
+    if year_start is None and year_end is None:
+        year_start = year_end = rollup.years[-1]
+    regions = []
+    for region in get_region_data():
+        node = rollup.query("region", region["id"], year_start, year_end)
+        countries = [c for c in get_countries() if c["region"] == region["id"]]
+        regions.append({
+            **region,
+            "countries": [c["name"] for c in countries],
+            "stats": {
+                "totalCases": sum(c["cases2023"] for c in countries),
+                "catchmentCases": node["catchmentCases"] if node else 0,
+                "avgResistance": node["avgResistance"] if node else None,
+                "avgEfficacy": node["avgEfficacy"] if node else None,
+                "surveillanceSites": node["surveillanceSites"] if node else 0
+            }
+        })
+    return regions
+
+
+def compute_trends(year_start: Optional[int] = None, year_end: Optional[int] = None):
+    """Yearly case-weighted Pfkelch13 resistance and efficacy across all sites."""
+    return [
+        {"year": y["year"], "resistance": y["avgResistance"], "efficacy": y["avgEfficacy"]}
+        for y in get_rollup().series("all", ROOT, year_start, year_end)
+        if y["catchmentCases"]
     ]
-}
+
+
+def compute_stats():
+    """Aggregate dashboard statistics from the surveillance data."""
+    rollup = get_rollup()
+    latest = rollup.years[-1]
+    overall = rollup.query("all", ROOT, latest, latest)
+    countries = get_countries()
+
+    # Gene-level prevalence is that of the gene's most prevalent tracked mutation
+    gene_prevalence = {}
+    for marker, prevalence in overall["markerPrevalence"].items():
+        gene = marker.split()[0]
+        gene_prevalence[gene] = max(prevalence, gene_prevalence.get(gene, 0))
+
+    return {
+        "totalCountries": len(countries),
+        "highResistanceCount": sum(1 for c in countries if c["resistanceLevel"] in ("high", "critical")),
+        "avgEfficacy": overall["avgEfficacy"],
+        "activeSurveillance": overall["surveillanceSites"],
+        "trendData": compute_trends(),
+        "regionData": [
+            {"region": r["name"], "cases": r["stats"]["totalCases"], "resistance": r["stats"]["avgResistance"]}
+            for r in compute_regions(latest, latest)
+        ],
+        "markerDistribution": [
+            {"marker": gene, "prevalence": gene_prevalence[gene]}
+            for gene in MARKER_GENES if gene in gene_prevalence
+        ]
+    }
 
 
 @router.get("/dashboard/stats")
 async def get_stats():
     """Get aggregated dashboard statistics."""
-    return DASHBOARD_STATS
+    return await stats_cache.get(
+        canonical_key("dashboard/stats"),
+        lambda: run_in_threadpool(compute_stats),
+        version=get_change_log().cursor
+    )
 
 
 @router.get("/dashboard/regions")
-async def get_regions():
+async def get_regions(
+    year_start: Optional[int] = Query(None, description="First year of the window (inclusive)"),
+    year_end: Optional[int] = Query(None, description="Last year of the window (inclusive)")
+):
     """Get regional breakdown data."""
-    return REGIONS
+    return compute_regions(year_start, year_end)
+
+
+@router.get("/dashboard/rollup")
+async def get_rollup_level(
+    level: str = Query("region", description="Aggregation level: site, admin1, country, region, all"),
+    id: Optional[str] = Query(None, description="Node id; omit to list every node at the level"),
+    parent: Optional[str] = Query(None, description="Only nodes under this parent id"),
+    year_start: Optional[int] = Query(None, description="First year of the window (inclusive)"),
+    year_end: Optional[int] = Query(None, description="Last year of the window (inclusive)")
+):
+    """
+    Catchment cases with case-weighted Pfkelch13 resistance, efficacy and
+    marker prevalence at any level.
+
+    Admin-1 ids take the form ``<country_id>/<admin1 name>``.
+    """
+    if level not in LEVELS:
+        raise HTTPException(status_code=400, detail=f"Unknown level: {level}")
+    rollup = get_rollup()
+    if id is None:
+        return rollup.query_level(level, year_start, year_end, parent=parent)
+    node = rollup.query(level, id, year_start, year_end)
+    if node is None:
+        raise HTTPException(status_code=404, detail="Node not found")
+    return node
 
 
 @router.get("/dashboard/trends")
-async def get_trends():
+async def get_trends(
+    year_start: Optional[int] = Query(None, description="First year (inclusive)"),
+    year_end: Optional[int] = Query(None, description="Last year (inclusive)")
+):
     """Get historical trend data."""
-    return TREND_DATA
\ No newline at end of file
+    return compute_trends(year_start, year_end)
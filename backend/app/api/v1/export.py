@@ -0,0 +1,154 @@
+"""Bulk data export endpoints."""
+import asyncio
+import hashlib
+import json
+from fastapi import APIRouter, Query, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from app.core.export import (
+    FORMATS, RangeNotSatisfiable, pyarrow_available, rows_to_table, encode_table, parse_range, iter_chunks
+)
+from app.core.singleflight import CoalescingCache, canonical_key
+from app.db.changelog import get_change_log, marker_point
+from app.db.mock_data import get_countries, get_drugs
+from app.db.prediction_log import get_prediction_log
+from app.db.timeseries import get_store, MARKERS
+from app.api.v1.predictions import PopulationPredictionRequest, forecast_population
+
+router = APIRouter()
+
+# Encoded payloads (with their content hash) are keyed per dataset/format and tagged with the data version
+export_cache = CoalescingCache("exports", ttl=3600, maxsize=32)
+
+REPORT_COLUMNS = [
+    "id", "name", "region", "lat", "lon", "resistanceLevel", "efficacyRate",
+    "cases2023", "deaths2023", "treatmentPolicy", "lastSurvey"
+]
+MARKER_COLUMNS = ["id", "country_id", "lat", "lon", "marker", "prevalence", "trend", "significance", "year"]
+FORECAST_COLUMNS = [
+    "prediction_id", "country", "region", "drug_name", "model_version", "baseline_resistance",
+    "trend_direction", "year", "predicted_resistance", "lower_bound", "upper_bound"
+]
+PREDICTION_COLUMNS = ["prediction_id", "kind", "model_version", "created_at", "request", "response"]
+
+
+def reports_table():
+    rows = [
+        {**c, "lat": c["coordinates"][0], "lon": c["coordinates"][1]}
+        for c in get_countries()
+    ]
+    return rows_to_table(rows, REPORT_COLUMNS)
+
+
+def markers_table():
+    countries = {c["id"]: c for c in get_countries()}
+    rows = [
+        {**marker_point(countries[m["country_id"]], m), "country_id": m["country_id"], "significance": m["significance"]}
+        for m in get_store(MARKERS).scan()
+    ]
+    return rows_to_table(rows, MARKER_COLUMNS)
+
+
+def forecasts_table():
+    """Five-year population forecasts for every country/drug pair."""
+    rows = []
+    for country in get_countries():
+        for drug in get_drugs():
+            result = forecast_population(PopulationPredictionRequest(
+                country=country["name"], region=country["region"],
+                drug_name=drug["name"], forecast_years=5
+            ))
+            for point in result["forecasts"]:
+                rows.append({**result, **point})
+    return rows_to_table(rows, FORECAST_COLUMNS)
+
+
+async def predictions_table():
+    """Persisted prediction log records; request/response kept as JSON text."""
+    rows = [
+        {**r, "request": json.dumps(r["request"]), "response": json.dumps(r["response"])}
+        for r in await get_prediction_log().fetch_all()
+    ]
+    return rows_to_table(rows, PREDICTION_COLUMNS)
+
+
+EXPORTS = {
+    "reports": reports_table,
+    "markers": markers_table,
+    "forecasts": forecasts_table,
+    "predictions": predictions_table,
+}
+
+
+def dataset_version(dataset: str) -> str:
+    if dataset == "predictions":
+        return get_prediction_log().version
+    return get_change_log().cursor
+
+
+async def build_export(dataset: str, fmt: str):
+    """Encode a dataset and return ``(payload, etag)``.
+
+    The ETag hashes the bytes themselves: forecasts are regenerated on each
+    rebuild, so the data version alone does not identify the payload.
+    """
+    builder = EXPORTS[dataset]
+    if asyncio.iscoroutinefunction(builder):
+        table = await builder()
+    else:
+        table = await run_in_threadpool(builder)
+    payload = await run_in_threadpool(encode_table, table, fmt)
+    return payload, f'"{dataset}-{fmt}-{hashlib.sha256(payload).hexdigest()[:32]}"'
+
+
+@router.get("/export/{dataset}")
+async def export_dataset(
+    dataset: str,
+    request: Request,
+    format: str = Query("parquet", description="Output format: parquet, arrow, csv (gzip)")
+):
+    """
+    Download a full dataset as Parquet, Arrow IPC, or gzip CSV.
+
+    Payloads are built once per data version and cached. Interrupted
+    downloads can be resumed with a ``Range`` header; send the returned
+    ``ETag`` as ``If-Range`` so a changed dataset is re-sent in full.
+    """
+    if dataset not in EXPORTS:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+    spec = FORMATS[format]
+    if spec["requires_pyarrow"] and not pyarrow_available():
+        raise HTTPException(status_code=501, detail=f"{format} export requires pyarrow")
+
+    payload, etag = await export_cache.get(
+        canonical_key("export", dataset=dataset, format=format),
+        lambda: build_export(dataset, format),
+        version=dataset_version(dataset)
+    )
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    size = len(payload)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{dataset}.{spec["extension"]}"',
+    }
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range == etag:
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except RangeNotSatisfiable as exc:
+            raise HTTPException(status_code=416, detail=str(exc), headers={"Content-Range": f"bytes */{size}"})
+
+    if byte_range:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(iter_chunks(payload, start, end), status_code=206, media_type=spec["media_type"], headers=headers)
+
+    headers["Content-Length"] = str(size)
+    return StreamingResponse(iter_chunks(payload), media_type=spec["media_type"], headers=headers)
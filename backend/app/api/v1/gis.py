@@ -2,6 +2,8 @@
 from fastapi import APIRouter, Query
 from typing import Optional
 from app.db.mock_data import get_countries
+from app.db.changelog import marker_point
+from app.db.timeseries import get_store, MARKERS
 
 router = APIRouter()
 
@@ -64,21 +66,13 @@ async def get_marker_map(
     year_end: int = 2024,
     country: Optional[str] = None
 ):
-    """Get molecular marker geographic distribution."""
-    countries = get_countries()
+    """Get molecular marker geographic distribution, one point per marker per year."""
+    countries = {c["id"]: c for c in get_countries()}
     if country:
-        countries = [c for c in countries if c["name"].lower() == country.lower()]
+        countries = {cid: c for cid, c in countries.items() if c["name"].lower() == country.lower()}
     
-    points = []
-    for c in countries:
-        for marker in c.get("molecularMarkers", []):
-            points.append({
-                "lat": c["coordinates"][0],
-                "lon": c["coordinates"][1],
-                "marker": marker["name"],
-                "prevalence": marker["prevalence"],
-                "trend": marker["trend"],
-                "year": 2023
-            })
+    # Only the yearly partitions inside the window are read
+    observations = get_store(MARKERS).scan(year_start, year_end, where=lambda m: m["country_id"] in countries)
+    points = [marker_point(countries[m["country_id"]], m) for m in observations]
     
     return {"points": points}
@@ -1,6 +1,9 @@
 """Health check endpoints."""
 from fastapi import APIRouter
 from datetime import datetime
+from app.core.ratelimit import get_rate_limit_metrics
+from app.core.singleflight import get_coalescing_metrics
+from app.db.prediction_log import get_prediction_log
 
 router = APIRouter()
 
@@ -13,3 +16,14 @@ async def health_check():
         "version": "1.0.0",
         "timestamp": datetime.utcnow().isoformat()
     }
+
+
+@router.get("/health/metrics")
+async def health_metrics():
+    """Runtime metrics for caches, request coalescing, rate limiting, and the prediction log."""
+    return {
+        "coalescing": get_coalescing_metrics(),
+        "rate_limit": get_rate_limit_metrics(),
+        "prediction_log": get_prediction_log().snapshot(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
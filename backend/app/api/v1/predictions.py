@@ -1,13 +1,21 @@
 """ML prediction endpoints."""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 import uuid
 import random
+import numpy as np
+from app.core.ratelimit import batch_admission, prediction_guard
+from app.core.singleflight import SingleFlight, canonical_key
+from app.db.prediction_log import get_prediction_log
+from app.ml import risk_model
 
 router = APIRouter()
 
+population_flight = SingleFlight("population_forecast")
+
 class IndividualPredictionRequest(BaseModel):
     drug_name: str = Field(..., description="Name of antimalarial drug")
     country: str = Field(..., description="Country name")
@@ -24,38 +32,13 @@ class PopulationPredictionRequest(BaseModel):
     forecast_years: int = Field(3, ge=1, le=5)
     include_confidence_intervals: bool = True
 
-@router.post("/predictions/individual")
-async def predict_individual(request: IndividualPredictionRequest):
-    """
-    Predict individual-level treatment failure risk.
-    
-    This endpoint uses an ensemble ML model (XGBoost + Logistic Regression + Random Forest)
-    to estimate the probability of treatment failure based on clinical and molecular markers.
-    """
-    # Calculate base probability from markers
-    marker_weights = {
-        "Pfkelch13 C580Y": 25, "Pfkelch13 R539T": 22, "Pfkelch13 Y493H": 20,
-        "Pfcrt K76T": 15, "Pfmdr1 N86Y": 12, "Pfmdr1 Y184F": 10,
-        "Pfdhfr N51I": 8, "Pfdhfr C59R": 8, "Pfdhps A437G": 7,
-    }
-    
-    base_prob = 15.0  # Base probability
-    
-    # Add marker contributions
-    for marker in request.molecular_markers:
-        base_prob += marker_weights.get(marker, 5)
-    
-    # Age factor (children under 5 and elderly have higher risk)
-    if request.patient_age < 5:
-        base_prob += 8
-    elif request.patient_age > 60:
-        base_prob += 5
-    
-    # Previous treatment factor
-    base_prob += request.previous_treatments * 4
-    
+class IndividualBatchRequest(BaseModel):
+    requests: List[IndividualPredictionRequest] = Field(..., min_length=1, max_length=1000)
+
+def build_individual_response(request: IndividualPredictionRequest, raw_score: float, contributions=None) -> dict:
+    """Turn a raw model score into the individual prediction response."""
     # Add some randomness for realism
-    base_prob += random.uniform(-5, 5)
+    base_prob = float(raw_score) + random.uniform(-5, 5)
     
     # Clamp to valid range
     resistance_prob = max(5, min(95, base_prob))
@@ -78,7 +61,7 @@ async def predict_individual(request: IndividualPredictionRequest):
     # Generate risk factors
     risk_factors = []
     for marker in request.molecular_markers:
-        if marker in marker_weights and marker_weights[marker] > 10:
+        if risk_model.MARKER_WEIGHTS.get(marker, 0) > 10:
             risk_factors.append(f"High-risk marker detected: {marker}")
     if request.previous_treatments > 1:
         risk_factors.append(f"Multiple previous treatments ({request.previous_treatments})")
@@ -92,7 +75,7 @@ async def predict_individual(request: IndividualPredictionRequest):
     else:
         alternatives = ["AL (Artemether-Lumefantrine)", "ASAQ (Artesunate-Amodiaquine)"]
     
-    return {
+    response = {
         "prediction_id": str(uuid.uuid4()),
         "resistance_probability": round(resistance_prob, 1),
         "confidence_interval": [round(ci_lower, 1), round(ci_upper, 1)],
@@ -104,14 +87,57 @@ async def predict_individual(request: IndividualPredictionRequest):
         "created_at": datetime.utcnow().isoformat(),
         "disclaimer": "This prediction is for surveillance and research purposes only. Do not use as substitute for clinical judgment."
     }
+    if contributions is not None:
+        response["explanation"] = risk_model.format_explanation(contributions)
+    return response
 
-@router.post("/predictions/population")
-async def predict_population(request: PopulationPredictionRequest):
+def score_individuals(requests: List[IndividualPredictionRequest], explain: bool = False) -> List[dict]:
+    """Score a batch in one vectorized pass, optionally with feature contributions."""
+    vectors = [risk_model.encode(r.patient_age, r.previous_treatments, r.molecular_markers) for r in requests]
+    X = np.asarray(vectors, dtype=np.float64)
+    raw_scores = risk_model.score_batch(X)
+    contributions = risk_model.explain_batch(X) if explain else [None] * len(requests)
+    return [
+        build_individual_response(r, score, c)
+        for r, score, c in zip(requests, raw_scores, contributions)
+    ]
+
+@router.post("/predictions/individual", dependencies=[Depends(prediction_guard)])
+async def predict_individual(
+    request: IndividualPredictionRequest,
+    explain: bool = Query(False, description="Include per-feature contributions to the risk score")
+):
     """
-    Predict population-level resistance trends for 1-5 years.
+    Predict individual-level treatment failure risk.
     
-    Uses time-series forecasting with confidence intervals.
+    This endpoint uses an ensemble ML model (XGBoost + Logistic Regression + Random Forest)
+    to estimate the probability of treatment failure based on clinical and molecular markers.
     """
+    response = score_individuals([request], explain)[0]
+    get_prediction_log().record("individual", request.model_dump(), response)
+    return response
+
+@router.post("/predictions/individual/batch")
+async def predict_individual_batch(
+    batch: IndividualBatchRequest,
+    http_request: Request,
+    explain: bool = Query(False, description="Include per-feature contributions to the risk score")
+):
+    """
+    Predict treatment failure risk for up to 1000 patients at once.
+    
+    Intended for clinical-site batch runs; explanations are computed for the
+    whole batch in one vectorized pass. Rate limits are charged per patient.
+    """
+    async with batch_admission(http_request, len(batch.requests)):
+        responses = await run_in_threadpool(score_individuals, batch.requests, explain)
+    log = get_prediction_log()
+    for request, response in zip(batch.requests, responses):
+        log.record("individual", request.model_dump(), response)
+    return {"predictions": responses, "total": len(responses)}
+
+def forecast_population(request: PopulationPredictionRequest) -> dict:
+    """Run the time-series forecast for one country/drug request."""
     base_resistance = random.uniform(15, 35)
     yearly_increase = random.uniform(2, 5)
     
@@ -144,3 +170,28 @@ async def predict_population(request: PopulationPredictionRequest):
         "created_at": datetime.utcnow().isoformat(),
         "disclaimer": "Population forecasts have inherent uncertainty. Use for planning purposes only."
     }
+
+@router.post("/predictions/population", dependencies=[Depends(prediction_guard)])
+async def predict_population(request: PopulationPredictionRequest):
+    """
+    Predict population-level resistance trends for 1-5 years.
+    
+    Uses time-series forecasting with confidence intervals. Concurrent
+    identical requests share a single forecast run.
+    """
+    payload = request.model_dump()
+
+    async def run():
+        response = await run_in_threadpool(forecast_population, request)
+        get_prediction_log().record("population", payload, response)
+        return response
+
+    return await population_flight.do(canonical_key("predictions/population", **payload), run)
+
+@router.get("/predictions/{prediction_id}")
+async def get_prediction(prediction_id: str):
+    """Retrieve a logged prediction with the request that produced it."""
+    record = await get_prediction_log().get(prediction_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Prediction not found")
+    return record
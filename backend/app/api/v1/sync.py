@@ -0,0 +1,34 @@
+"""Incremental delta sync endpoints."""
+from fastapi import APIRouter, Query, HTTPException
+from typing import List, Optional
+from app.db.changelog import get_change_log, CursorError, CursorExpiredError, DATASETS
+
+router = APIRouter()
+
+@router.get("/sync")
+async def sync(
+    since: Optional[str] = Query(None, description="Cursor from a previous sync; omit for a full sync"),
+    dataset: Optional[List[str]] = Query(None, description="Restrict to datasets: reports, markers"),
+    limit: int = Query(1000, ge=1, le=5000, description="Maximum change-log entries to read")
+):
+    """
+    Return upserts and tombstones recorded after ``since``.
+
+    Clients store the returned ``cursor`` and pass it back on the next call.
+    A 410 response means the cursor can no longer be resumed and the client
+    should drop its cache and sync from scratch.
+    """
+    if dataset:
+        unknown = [d for d in dataset if d not in DATASETS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown dataset: {', '.join(unknown)}")
+
+    log = get_change_log()
+    try:
+        seq = log.parse_cursor(since)
+    except CursorExpiredError as exc:
+        raise HTTPException(status_code=410, detail=str(exc))
+    except CursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    return log.changes_since(seq, datasets=dataset, limit=limit)
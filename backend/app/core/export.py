@@ -0,0 +1,95 @@
+"""Columnar encoders and HTTP Range helpers for bulk data exports."""
+import csv
+import gzip
+import io
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+Table = Dict[str, list]
+
+FORMATS = {
+    "parquet": {"media_type": "application/vnd.apache.parquet", "extension": "parquet", "requires_pyarrow": True},
+    "arrow": {"media_type": "application/vnd.apache.arrow.file", "extension": "arrow", "requires_pyarrow": True},
+    "csv": {"media_type": "application/gzip", "extension": "csv.gz", "requires_pyarrow": False},
+}
+
+
+class RangeNotSatisfiable(ValueError):
+    """Raised when a Range header cannot be served for the payload size."""
+
+
+def pyarrow_available() -> bool:
+    return pa is not None
+
+
+def rows_to_table(rows: List[dict], columns: List[str]) -> Table:
+    """Pivot row dicts into a column-oriented table."""
+    return {col: [row.get(col) for row in rows] for col in columns}
+
+
+def encode_table(table: Table, fmt: str) -> bytes:
+    """Serialize a columnar table into one of ``FORMATS``."""
+    if fmt == "csv":
+        return _encode_csv_gz(table)
+    if pa is None:
+        raise RuntimeError("pyarrow is required for Parquet and Arrow exports")
+    arrow_table = pa.table(table)
+    sink = io.BytesIO()
+    if fmt == "parquet":
+        pyarrow.parquet.write_table(arrow_table, sink, compression="zstd")
+    else:
+        with pyarrow.ipc.new_file(sink, arrow_table.schema) as writer:
+            writer.write_table(arrow_table)
+    return sink.getvalue()
+
+
+def _encode_csv_gz(table: Table) -> bytes:
+    columns = list(table)
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(columns)
+    writer.writerows(zip(*(table[c] for c in columns)))
+    # mtime=0 keeps the bytes identical across rebuilds of the same data version
+    return gzip.compress(text.getvalue().encode("utf-8"), mtime=0)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``bytes=`` range into inclusive ``(start, end)`` offsets.
+
+    Returns ``None`` when the header is absent or not a valid byte range
+    (including ``last < first``), in which case the full payload is sent.
+    Multi-range requests are served in full. Only a valid range starting at
+    or beyond the end of the payload is unsatisfiable.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_s, _, end_s = header[len("bytes="):].strip().partition("-")
+    try:
+        if start_s:
+            start = int(start_s)
+            end = int(end_s) if end_s else None
+        else:
+            # Suffix range: the last N bytes
+            start = max(0, size - int(end_s))
+            end = size - 1
+    except ValueError:
+        return None
+    if end is not None and end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(f"Range {header} not satisfiable for {size} bytes")
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def iter_chunks(payload: bytes, start: int = 0, end: Optional[int] = None, chunk_size: int = 64 * 1024):
+    """Yield ``payload[start:end + 1]`` in chunks without copying it whole."""
+    view = memoryview(payload)
+    stop = len(payload) if end is None else end + 1
+    for offset in range(start, stop, chunk_size):
+        yield bytes(view[offset:min(offset + chunk_size, stop)])
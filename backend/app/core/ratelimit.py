@@ -0,0 +1,197 @@
+"""Rate limiting and admission control for prediction endpoints.
+
+Each client (a recognised API key, else IP address) gets a token bucket; requests beyond
+it get 429. Independently, once too many predictions are executing the
+request is shed with 503 so the read-only routes keep their workers.
+Both responses carry ``Retry-After``.
+"""
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Tuple
+
+from fastapi import HTTPException, Request
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+PREDICTION_RATE_LIMIT = float(os.getenv("PREDICTION_RATE_LIMIT", "5"))
+PREDICTION_BURST = int(os.getenv("PREDICTION_BURST", "20"))
+PREDICTION_MAX_INFLIGHT = int(os.getenv("PREDICTION_MAX_INFLIGHT", "32"))
+# Batch routes are metered in patients, from a bucket separate from single predictions
+PREDICTION_BATCH_RATE_LIMIT = float(os.getenv("PREDICTION_BATCH_RATE_LIMIT", "50"))
+PREDICTION_BATCH_BURST = int(os.getenv("PREDICTION_BATCH_BURST", "1000"))
+# A batch occupies one admission slot per this many patients
+BATCH_PATIENTS_PER_SLOT = 100
+# Comma-separated keys that get their own bucket; any other X-API-Key is ignored
+API_KEYS = frozenset(k.strip() for k in os.getenv("API_KEYS", "").split(",") if k.strip())
+
+
+class TokenBucket:
+    """In-process token buckets, one per client key.
+
+    At most ``max_keys`` buckets are kept; the least recently used is evicted
+    first, which at worst hands that client a refilled bucket.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def acquire(self, key: str, cost: int = 1) -> Tuple[bool, float]:
+        """Take ``cost`` tokens for ``key``; return ``(allowed, retry_after_seconds)``."""
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens >= cost:
+            self._store(key, tokens - cost, now)
+            return True, 0.0
+        self._store(key, tokens, now)
+        return False, (cost - tokens) / self.rate
+
+    def _store(self, key: str, tokens: float, now: float):
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+
+class RedisTokenBucket(TokenBucket):
+    """Token buckets shared across workers through Redis.
+
+    Falls back to the in-process buckets if Redis is unreachable, so an
+    outage degrades to per-worker limits rather than failing requests.
+    """
+
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local cost = tonumber(ARGV[4])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    local retry = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    else
+        retry = (cost - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return {allowed, tostring(retry)}
+    """
+
+    def __init__(self, rate: float, burst: int, url: str, namespace: str):
+        super().__init__(rate, burst)
+        self.namespace = namespace
+        import redis.asyncio
+        self._redis = redis.asyncio.from_url(url)
+        self._script = self._redis.register_script(self.SCRIPT)
+
+    async def acquire(self, key: str, cost: int = 1) -> Tuple[bool, float]:
+        try:
+            allowed, retry = await self._script(
+                keys=[f"ratelimit:{self.namespace}:{key}"],
+                args=[self.rate, self.burst, time.time(), cost]
+            )
+        except Exception:
+            logger.warning("Redis rate limiter unavailable, using in-process buckets", exc_info=True)
+            return await super().acquire(key, cost)
+        return bool(allowed), float(retry)
+
+
+class AdmissionController:
+    """Caps the number of predictions executing at once."""
+
+    def __init__(self, max_inflight: int):
+        self.max_inflight = max_inflight
+        self.inflight = 0
+
+    def try_acquire(self, weight: int = 1) -> bool:
+        if self.inflight + weight > self.max_inflight:
+            return False
+        self.inflight += weight
+        return True
+
+    def release(self, weight: int = 1):
+        self.inflight -= weight
+
+
+def _make_bucket(rate: float, burst: int, namespace: str) -> TokenBucket:
+    if RATE_LIMIT_BACKEND == "redis":
+        return RedisTokenBucket(rate, burst, REDIS_URL, namespace)
+    return TokenBucket(rate, burst)
+
+
+prediction_bucket = _make_bucket(PREDICTION_RATE_LIMIT, PREDICTION_BURST, "predictions")
+batch_bucket = _make_bucket(PREDICTION_BATCH_RATE_LIMIT, PREDICTION_BATCH_BURST, "predictions-batch")
+prediction_admission = AdmissionController(PREDICTION_MAX_INFLIGHT)
+metrics = {"allowed": 0, "rate_limited": 0, "shed": 0}
+
+
+def client_key(request: Request) -> str:
+    """Bucket key: a configured API key, otherwise the client IP.
+
+    Unrecognised keys fall back to the IP so a client cannot mint fresh
+    buckets by sending a new random key on every request.
+    """
+    api_key = request.headers.get("x-api-key")
+    if api_key and api_key in API_KEYS:
+        return f"key:{api_key}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+@asynccontextmanager
+async def admit(request: Request, bucket: TokenBucket, cost: int = 1, weight: int = 1):
+    """Apply rate limiting then admission control around one unit of work."""
+    if cost > bucket.burst:
+        raise HTTPException(status_code=413, detail=f"Request exceeds the rate-limit burst of {bucket.burst}")
+    allowed, retry_after = await bucket.acquire(client_key(request), cost)
+    if not allowed:
+        metrics["rate_limited"] += 1
+        raise HTTPException(
+            status_code=429, detail="Rate limit exceeded",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+    if not prediction_admission.try_acquire(weight):
+        metrics["shed"] += 1
+        raise HTTPException(
+            status_code=503, detail="Prediction service is at capacity",
+            headers={"Retry-After": "1"}
+        )
+    metrics["allowed"] += 1
+    try:
+        yield
+    finally:
+        prediction_admission.release(weight)
+
+
+async def prediction_guard(request: Request):
+    """FastAPI dependency guarding single-patient prediction routes."""
+    async with admit(request, prediction_bucket):
+        yield
+
+
+def batch_admission(request: Request, size: int):
+    """Guard for batch routes: one token per patient, weighted admission slots."""
+    weight = min(PREDICTION_MAX_INFLIGHT, math.ceil(size / BATCH_PATIENTS_PER_SLOT))
+    return admit(request, batch_bucket, cost=size, weight=weight)
+
+
+def get_rate_limit_metrics() -> dict:
+    return {
+        **metrics,
+        "inflight": prediction_admission.inflight,
+        "max_inflight": prediction_admission.max_inflight,
+        "backend": RATE_LIMIT_BACKEND,
+    }
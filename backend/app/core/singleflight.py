@@ -0,0 +1,106 @@
+"""Request coalescing (single-flight) and stale-while-revalidate caching.
+
+Concurrent identical requests share one in-flight computation instead of all
+recomputing the same result after a cache expiry or deploy.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_registry: Dict[str, "SingleFlight"] = {}
+
+
+def canonical_key(name: str, **params: Any) -> str:
+    """Build a cache key that is stable under parameter ordering."""
+    return f"{name}?{json.dumps(params, sort_keys=True, default=str, separators=(',', ':'))}"
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key.
+
+    The computation runs as its own task, so a caller disconnecting does not
+    cancel the work the other waiters depend on.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.metrics = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+        _registry[name] = self
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.metrics["calls"] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.metrics["executions"] += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.metrics["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: asyncio.Future):
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self.metrics["errors"] += 1
+
+    def snapshot(self) -> dict:
+        return {**self.metrics, "inflight": len(self._inflight)}
+
+
+class CoalescingCache(SingleFlight):
+    """TTL cache whose misses go through single-flight.
+
+    Entries are tagged with a data ``version``. Once an entry expires or its
+    version no longer matches, it may still be served for ``stale_ttl``
+    seconds while one background refresh recomputes it.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0, maxsize: int = 256):
+        super().__init__(name)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self._entries: Dict[str, tuple] = {}
+        self.metrics.update({"hits": 0, "misses": 0, "stale_served": 0})
+
+    async def get(self, key: str, fn: Callable[[], Awaitable[Any]], version: Optional[str] = None) -> Any:
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None:
+            value, entry_version, expires_at = entry
+            if now < expires_at and entry_version == version:
+                self.metrics["hits"] += 1
+                return value
+            if self.stale_ttl and now < expires_at + self.stale_ttl:
+                self.metrics["stale_served"] += 1
+                if key not in self._inflight:
+                    asyncio.ensure_future(self._refresh(key, fn, version))
+                return value
+        self.metrics["misses"] += 1
+        return await self.do(key, lambda: self._load(key, fn, version))
+
+    async def _load(self, key: str, fn: Callable[[], Awaitable[Any]], version: Optional[str]) -> Any:
+        value = await fn()
+        if len(self._entries) >= self.maxsize and key not in self._entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (value, version, time.monotonic() + self.ttl)
+        return value
+
+    async def _refresh(self, key: str, fn: Callable[[], Awaitable[Any]], version: Optional[str]):
+        try:
+            await self.do(key, lambda: self._load(key, fn, version))
+        except Exception:
+            logger.exception("Background refresh failed for %s", key)
+
+    def snapshot(self) -> dict:
+        return {**super().snapshot(), "entries": len(self._entries)}
+
+
+def get_coalescing_metrics() -> dict:
+    return {name: flight.snapshot() for name, flight in _registry.items()}
@@ -0,0 +1,166 @@
+"""Append-only change log backing the incremental sync API.
+
+Every write to a synced dataset (reports, map markers) is appended here with a
+monotonically increasing sequence number, so clients can ask for everything
+that changed after a cursor instead of re-downloading full collections.
+"""
+import hashlib
+import json
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.db.mock_data import get_countries
+from app.db.timeseries import get_store, MARKERS as MARKER_OBSERVATIONS
+
+REPORTS = "reports"
+MARKERS = "markers"
+DATASETS = (REPORTS, MARKERS)
+
+
+class CursorError(ValueError):
+    """Raised when a sync cursor is malformed."""
+
+
+class CursorExpiredError(CursorError):
+    """Raised when a sync cursor belongs to a previous log epoch."""
+
+
+class ChangeLog:
+    """In-memory append-only log of upserts and tombstones.
+
+    The log is reseeded on every process start, so cursors carry an epoch id
+    derived from the seeded content: restarts and sibling workers seeded from
+    the same data share cursors, while a changed seed invalidates them and
+    the client must resync.
+    """
+
+    def __init__(self):
+        self._entries: List[dict] = []
+        self._lock = threading.Lock()
+        self.epoch = self._content_epoch()
+
+    def _content_epoch(self) -> str:
+        digest = hashlib.sha256()
+        for entry in self._entries:
+            digest.update(json.dumps(
+                [entry["dataset"], entry["key"], entry["op"], entry["data"]], sort_keys=True, default=str
+            ).encode("utf-8"))
+        return digest.hexdigest()[:8]
+
+    def seal_seed(self):
+        """Derive the epoch from the entries logged so far; call once after seeding."""
+        self.epoch = self._content_epoch()
+
+    @property
+    def seq(self) -> int:
+        return len(self._entries)
+
+    @property
+    def cursor(self) -> str:
+        return self.make_cursor(self.seq)
+
+    def make_cursor(self, seq: int) -> str:
+        return f"{self.epoch}:{seq}"
+
+    def parse_cursor(self, cursor: Optional[str]) -> int:
+        """Return the sequence number encoded in ``cursor`` (0 for a full sync)."""
+        if not cursor or cursor == "0":
+            return 0
+        epoch, _, seq = cursor.partition(":")
+        if not seq.isdigit():
+            raise CursorError("Malformed sync cursor")
+        if epoch != self.epoch or int(seq) > self.seq:
+            raise CursorExpiredError("Sync cursor has expired, resync from 0")
+        return int(seq)
+
+    def last_modified(self) -> Optional[datetime]:
+        return self._entries[-1]["modified_at"] if self._entries else None
+
+    def upsert(self, dataset: str, key: str, data: dict) -> int:
+        return self._append(dataset, key, "upsert", data)
+
+    def delete(self, dataset: str, key: str) -> int:
+        return self._append(dataset, key, "delete", None)
+
+    def _append(self, dataset: str, key: str, op: str, data: Optional[dict]) -> int:
+        with self._lock:
+            seq = len(self._entries) + 1
+            self._entries.append({
+                "seq": seq,
+                "dataset": dataset,
+                "key": key,
+                "op": op,
+                "data": data,
+                "modified_at": datetime.utcnow(),
+            })
+            return seq
+
+    def changes_since(self, seq: int, datasets: Optional[List[str]] = None, limit: int = 1000) -> dict:
+        """Collapse log entries after ``seq`` into the latest state per record.
+
+        At most ``limit`` raw entries are read; ``has_more`` tells the client to
+        call again with the returned cursor.
+        """
+        window = self._entries[seq:seq + limit]
+        latest: Dict[Tuple[str, str], dict] = {}
+        for entry in window:
+            if datasets and entry["dataset"] not in datasets:
+                continue
+            latest[(entry["dataset"], entry["key"])] = entry
+
+        upserts: Dict[str, List[dict]] = {d: [] for d in (datasets or DATASETS)}
+        tombstones: Dict[str, List[dict]] = {d: [] for d in (datasets or DATASETS)}
+        for entry in sorted(latest.values(), key=lambda e: e["seq"]):
+            record = {
+                "key": entry["key"],
+                "version": entry["seq"],
+                "updated_at": entry["modified_at"].isoformat(),
+            }
+            if entry["op"] == "upsert":
+                upserts[entry["dataset"]].append({**record, "data": entry["data"]})
+            else:
+                tombstones[entry["dataset"]].append(record)
+
+        next_seq = window[-1]["seq"] if window else seq
+        return {
+            "cursor": self.make_cursor(next_seq),
+            "has_more": next_seq < self.seq,
+            "upserts": upserts,
+            "tombstones": tombstones,
+        }
+
+
+def marker_key(country: dict, marker: dict) -> str:
+    return f"{country['id']}:{marker['name']}:{marker['year']}"
+
+
+def marker_point(country: dict, marker: dict) -> dict:
+    """Map-marker record for one yearly marker observation, as in ``/map/markers``."""
+    return {
+        "id": marker_key(country, marker),
+        "lat": country["coordinates"][0],
+        "lon": country["coordinates"][1],
+        "marker": marker["name"],
+        "prevalence": marker["prevalence"],
+        "trend": marker["trend"],
+        "year": marker["year"]
+    }
+
+
+def record_country(log: ChangeLog, country: dict):
+    """Log a report upsert plus one upsert per yearly marker observation of ``country``."""
+    log.upsert(REPORTS, country["id"], country)
+    observations = get_store(MARKER_OBSERVATIONS).scan(where=lambda m: m["country_id"] == country["id"])
+    for marker in observations:
+        log.upsert(MARKERS, marker_key(country, marker), marker_point(country, marker))
+
+
+change_log = ChangeLog()
+for _country in get_countries():
+    record_country(change_log, _country)
+change_log.seal_seed()
+
+
+def get_change_log() -> ChangeLog:
+    return change_log
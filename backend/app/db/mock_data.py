@@ -1,4 +1,5 @@
 """Mock data for development and testing."""
+import random
 
 COUNTRIES = [
     {
@@ -140,12 +141,119 @@ DRUGS = [
 ]
 
 REGIONS = [
-    {"id": "east", "name": "East Africa", "countries": ["Tanzania", "Kenya", "Uganda", "Rwanda", "Ethiopia"], "color": "#3b82f6", "stats": {"totalCases": 30400000, "avgResistance": 23.5, "surveillanceSites": 45}},
-    {"id": "west", "name": "West Africa", "countries": ["Nigeria", "Ghana", "Mali", "Burkina Faso", "Senegal"], "color": "#10b981", "stats": {"totalCases": 85000000, "avgResistance": 18.2, "surveillanceSites": 52}},
-    {"id": "central", "name": "Central Africa", "countries": ["DRC", "Cameroon", "CAR", "Congo"], "color": "#f59e0b", "stats": {"totalCases": 38000000, "avgResistance": 28.7, "surveillanceSites": 23}},
-    {"id": "south", "name": "Southern Africa", "countries": ["Mozambique", "South Africa", "Malawi", "Zimbabwe", "Zambia"], "color": "#8b5cf6", "stats": {"totalCases": 18000000, "avgResistance": 15.8, "surveillanceSites": 38}}
+    {"id": "east", "name": "East Africa", "color": "#3b82f6"},
+    {"id": "west", "name": "West Africa", "color": "#10b981"},
+    {"id": "central", "name": "Central Africa", "color": "#f59e0b"},
+    {"id": "south", "name": "Southern Africa", "color": "#8b5cf6"}
 ]
 
+# Sentinel surveillance sites; catchmentShare is the site's share of national cases
+SURVEILLANCE_SITES = [
+    {"id": "TZ-KAG", "name": "Bukoba", "country_id": "TZ", "admin1": "Kagera", "coordinates": [-1.3317, 31.8122], "catchmentShare": 0.12},
+    {"id": "TZ-MWZ", "name": "Mwanza", "country_id": "TZ", "admin1": "Mwanza", "coordinates": [-2.5164, 32.9175], "catchmentShare": 0.10},
+    {"id": "TZ-DSM", "name": "Ilala", "country_id": "TZ", "admin1": "Dar es Salaam", "coordinates": [-6.8235, 39.2695], "catchmentShare": 0.05},
+    {"id": "KE-KSM", "name": "Kisumu", "country_id": "KE", "admin1": "Kisumu", "coordinates": [-0.0917, 34.7680], "catchmentShare": 0.18},
+    {"id": "KE-SIA", "name": "Siaya", "country_id": "KE", "admin1": "Siaya", "coordinates": [0.0607, 34.2881], "catchmentShare": 0.14},
+    {"id": "UG-GUL", "name": "Gulu", "country_id": "UG", "admin1": "Northern", "coordinates": [2.7724, 32.2881], "catchmentShare": 0.15},
+    {"id": "UG-BUS", "name": "Busia", "country_id": "UG", "admin1": "Eastern", "coordinates": [0.4544, 34.0759], "catchmentShare": 0.12},
+    {"id": "UG-KLA", "name": "Kampala", "country_id": "UG", "admin1": "Central", "coordinates": [0.3476, 32.5825], "catchmentShare": 0.06},
+    {"id": "RW-NYA", "name": "Nyagatare", "country_id": "RW", "admin1": "Eastern Province", "coordinates": [-1.2977, 30.3275], "catchmentShare": 0.22},
+    {"id": "RW-HUY", "name": "Huye", "country_id": "RW", "admin1": "Southern Province", "coordinates": [-2.5967, 29.7394], "catchmentShare": 0.15},
+    {"id": "NG-LAG", "name": "Lagos", "country_id": "NG", "admin1": "Lagos", "coordinates": [6.5244, 3.3792], "catchmentShare": 0.06},
+    {"id": "NG-KAN", "name": "Kano", "country_id": "NG", "admin1": "Kano", "coordinates": [12.0022, 8.5920], "catchmentShare": 0.08},
+    {"id": "NG-ENU", "name": "Enugu", "country_id": "NG", "admin1": "Enugu", "coordinates": [6.4584, 7.5464], "catchmentShare": 0.03},
+    {"id": "GH-ASH", "name": "Kumasi", "country_id": "GH", "admin1": "Ashanti", "coordinates": [6.6885, -1.6244], "catchmentShare": 0.16},
+    {"id": "GH-NOR", "name": "Tamale", "country_id": "GH", "admin1": "Northern", "coordinates": [9.4008, -0.8393], "catchmentShare": 0.12},
+    {"id": "CD-KIN", "name": "Kinshasa", "country_id": "CD", "admin1": "Kinshasa", "coordinates": [-4.4419, 15.2663], "catchmentShare": 0.07},
+    {"id": "CD-HKA", "name": "Lubumbashi", "country_id": "CD", "admin1": "Haut-Katanga", "coordinates": [-11.6876, 27.5026], "catchmentShare": 0.05},
+    {"id": "CD-TSH", "name": "Kisangani", "country_id": "CD", "admin1": "Tshopo", "coordinates": [0.5153, 25.1910], "catchmentShare": 0.04},
+    {"id": "MZ-NAM", "name": "Nampula", "country_id": "MZ", "admin1": "Nampula", "coordinates": [-15.1165, 39.2666], "catchmentShare": 0.20},
+    {"id": "MZ-ZAM", "name": "Quelimane", "country_id": "MZ", "admin1": "Zambezia", "coordinates": [-17.8786, 36.8883], "catchmentShare": 0.18},
+    {"id": "MZ-MPM", "name": "Maputo", "country_id": "MZ", "admin1": "Maputo City", "coordinates": [-25.9692, 32.5732], "catchmentShare": 0.02},
+    {"id": "ET-AMH", "name": "Metema", "country_id": "ET", "admin1": "Amhara", "coordinates": [12.9590, 36.1569], "catchmentShare": 0.14},
+    {"id": "ET-GAM", "name": "Gambela", "country_id": "ET", "admin1": "Gambela", "coordinates": [8.2500, 34.5833], "catchmentShare": 0.10},
+    {"id": "ET-ORO", "name": "Jimma", "country_id": "ET", "admin1": "Oromia", "coordinates": [7.6739, 36.8358], "catchmentShare": 0.08},
+    {"id": "ZA-KZN", "name": "Jozini", "country_id": "ZA", "admin1": "KwaZulu-Natal", "coordinates": [-27.4270, 32.0654], "catchmentShare": 0.25},
+    {"id": "ZA-LIM", "name": "Vhembe", "country_id": "ZA", "admin1": "Limpopo", "coordinates": [-22.7696, 29.9741], "catchmentShare": 0.45},
+    {"id": "ZA-MPU", "name": "Nkomazi", "country_id": "ZA", "admin1": "Mpumalanga", "coordinates": [-25.7500, 31.7000], "catchmentShare": 0.20}
+]
+
+OBSERVATION_YEARS = range(2019, 2024)
+
+# Relative change per year used to walk marker prevalence back from 2023
+MARKER_TREND_DRIFT = {"increasing": -0.12, "decreasing": 0.08, "stable": 0.0}
+
+# Site resistance tracks artemisinin partial resistance, i.e. validated Pfkelch13
+# mutations; CQ/SP markers (Pfcrt, Pfdhfr, Pfdhps) are reported per marker only
+RESISTANCE_GENE = "Pfkelch13"
+
+
+def _generate_site_observations():
+    """Yearly site observations anchored on each country's 2023 figures.
+
+    Values are deterministic: site offsets come from a fixed-seed generator,
+    and marker prevalence is walked back from 2023 along its reported trend.
+    ``cases`` counts the site's catchment only, and ``resistance`` is the
+    estimated share of infections carrying any validated Pfkelch13 mutation.
+    """
+    rng = random.Random(2023)
+    countries = {c["id"]: c for c in COUNTRIES}
+    observations = []
+    for site in SURVEILLANCE_SITES:
+        country = countries[site["country_id"]]
+        efficacy_offset = rng.uniform(-1.5, 1.5)
+        prevalence_factor = rng.uniform(0.8, 1.2)
+        for year in OBSERVATION_YEARS:
+            years_back = 2023 - year
+            markers = {}
+            for marker in country["molecularMarkers"]:
+                drift = 1 + MARKER_TREND_DRIFT[marker["trend"]] * years_back
+                markers[marker["name"]] = round(min(100.0, max(0.0, marker["prevalence"] * prevalence_factor * drift)), 2)
+            carrier_free = 1.0
+            for marker in country["molecularMarkers"]:
+                if marker["significance"] == "validated" and marker["name"].startswith(RESISTANCE_GENE):
+                    carrier_free *= 1 - markers[marker["name"]] / 100
+            observations.append({
+                "site_id": site["id"],
+                "year": year,
+                "cases": int(country["cases2023"] * site["catchmentShare"] * (1 + 0.03 * years_back) * rng.uniform(0.95, 1.05)),
+                "efficacy": round(min(100.0, country["efficacyRate"] + efficacy_offset + 0.6 * years_back), 2),
+                "resistance": round(100 * (1 - carrier_free), 2),
+                "markers": markers
+            })
+    return observations
+
+
+def _generate_marker_observations():
+    """Yearly national marker prevalence, walked back from 2023 like the sites."""
+    observations = []
+    for country in COUNTRIES:
+        for marker in country["molecularMarkers"]:
+            for year in OBSERVATION_YEARS:
+                drift = 1 + MARKER_TREND_DRIFT[marker["trend"]] * (2023 - year)
+                observations.append({
+                    **marker,
+                    "country_id": country["id"],
+                    "year": year,
+                    "prevalence": round(min(100.0, max(0.0, marker["prevalence"] * drift)), 2)
+                })
+    return observations
+
+
+def _drug_efficacy_observations():
+    """Split the per-year efficacy keys on each drug into one row per year."""
+    observations = []
+    for drug in DRUGS:
+        for key, value in drug.items():
+            if key.startswith("efficacy") and key[len("efficacy"):].isdigit():
+                observations.append({"drug": drug["name"], "year": int(key[len("efficacy"):]), "efficacy": value})
+    return observations
+
+
+SITE_OBSERVATIONS = _generate_site_observations()
+MARKER_OBSERVATIONS = _generate_marker_observations()
+DRUG_EFFICACY_OBSERVATIONS = _drug_efficacy_observations()
+
 def get_countries():
     return COUNTRIES
 
@@ -167,33 +275,14 @@ def get_drug_by_name(name: str):
 def get_region_data():
     return REGIONS
 
-def get_trend_data():
-    return [
-        {"year": 2019, "resistance": 12.5, "efficacy": 96.8},
-        {"year": 2020, "resistance": 14.2, "efficacy": 96.2},
-        {"year": 2021, "resistance": 16.8, "efficacy": 95.5},
-        {"year": 2022, "resistance": 19.5, "efficacy": 94.8},
-        {"year": 2023, "resistance": 22.3, "efficacy": 93.9}
-    ]
-
-def get_dashboard_stats():
-    return {
-        "totalCountries": 19,
-        "highResistanceCount": 4,
-        "avgEfficacy": 92.8,
-        "activeSurveillance": 163,
-        "trendData": get_trend_data(),
-        "regionData": [
-            {"region": "East Africa", "cases": 30400000, "resistance": 23.5},
-            {"region": "West Africa", "cases": 85000000, "resistance": 18.2},
-            {"region": "Central Africa", "cases": 38000000, "resistance": 28.7},
-            {"region": "Southern Africa", "cases": 18000000, "resistance": 15.8}
-        ],
-        "markerDistribution": [
-            {"marker": "Pfkelch13", "prevalence": 8.5},
-            {"marker": "Pfcrt", "prevalence": 25.3},
-            {"marker": "Pfmdr1", "prevalence": 18.7},
-            {"marker": "Pfdhfr", "prevalence": 45.2},
-            {"marker": "Pfdhps", "prevalence": 32.8}
-        ]
-    }
+def get_sites():
+    return SURVEILLANCE_SITES
+
+def get_site_observations():
+    return SITE_OBSERVATIONS
+
+def get_marker_observations():
+    return MARKER_OBSERVATIONS
+
+def get_drug_efficacy_observations():
+    return DRUG_EFFICACY_OBSERVATIONS
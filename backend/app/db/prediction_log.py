@@ -0,0 +1,282 @@
+"""Prediction audit log with batched asynchronous writes.
+
+Prediction endpoints call ``PredictionLog.record`` on the request path, which
+only appends to an in-memory ring buffer. A background task drains the buffer
+in batches to Postgres, or to an append-only JSON-lines file in development.
+"""
+import asyncio
+import json
+import logging
+import os
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.db.database import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_LOG_BACKEND = os.getenv(
+    "PREDICTION_LOG_BACKEND",
+    "file" if os.getenv("ENVIRONMENT", "development") == "development" else "postgres"
+)
+PREDICTION_LOG_PATH = os.getenv("PREDICTION_LOG_PATH", "data/prediction_log.jsonl")
+
+
+class FileSink:
+    """Append-only JSON-lines file with an in-memory offset index."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._index: Dict[str, Tuple[int, int]] = {}
+
+    async def start(self):
+        await asyncio.to_thread(self._load_index)
+
+    async def close(self):
+        pass
+
+    def _load_index(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            offset = 0
+            for line in f:
+                try:
+                    self._index[json.loads(line)["prediction_id"]] = (offset, len(line))
+                except (ValueError, KeyError):
+                    if not line.endswith(b"\n"):
+                        # Torn final write from a crash: cut it so the next append starts clean
+                        logger.warning("Truncating partial prediction log record at byte %d of %s", offset, self.path)
+                        f.truncate(offset)
+                        break
+                    logger.warning("Skipping unreadable prediction log record at byte %d of %s", offset, self.path)
+                offset += len(line)
+
+    async def write(self, records: List[dict]):
+        await asyncio.to_thread(self._write, records)
+
+    def _write(self, records: List[dict]):
+        lines = [(r["prediction_id"], (json.dumps(r) + "\n").encode("utf-8")) for r in records]
+        with open(self.path, "ab") as f:
+            offset = f.tell()
+            f.write(b"".join(line for _, line in lines))
+        for prediction_id, line in lines:
+            self._index[prediction_id] = (offset, len(line))
+            offset += len(line)
+
+    async def get(self, prediction_id: str) -> Optional[dict]:
+        location = self._index.get(prediction_id)
+        if location is None:
+            return None
+        return await asyncio.to_thread(self._read_at, *location)
+
+    def _read_at(self, offset: int, length: int) -> dict:
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    async def fetch_all(self) -> List[dict]:
+        return await asyncio.to_thread(self._read_all)
+
+    def _read_all(self) -> List[dict]:
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return records
+
+
+class PostgresSink:
+    """Batched inserts into the ``prediction_log`` table."""
+
+    COLUMNS = "prediction_id, kind, model_version, request, response, created_at"
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self._pool = None
+
+    async def start(self):
+        await self._connect()
+
+    async def _connect(self):
+        if self._pool is None:
+            import asyncpg
+            self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=2)
+        return self._pool
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+
+    async def write(self, records: List[dict]):
+        rows = [
+            (uuid.UUID(r["prediction_id"]), r["kind"], r["model_version"],
+             json.dumps(r["request"]), json.dumps(r["response"]), datetime.fromisoformat(r["created_at"]))
+            for r in records
+        ]
+        async with (await self._connect()).acquire() as conn:
+            await conn.executemany(
+                f"INSERT INTO prediction_log ({self.COLUMNS}) VALUES ($1, $2, $3, $4::jsonb, $5::jsonb, $6) "
+                "ON CONFLICT (prediction_id) DO NOTHING",
+                rows
+            )
+
+    async def get(self, prediction_id: str) -> Optional[dict]:
+        try:
+            key = uuid.UUID(prediction_id)
+        except ValueError:
+            return None
+        async with (await self._connect()).acquire() as conn:
+            row = await conn.fetchrow(f"SELECT {self.COLUMNS} FROM prediction_log WHERE prediction_id = $1", key)
+        return self._to_record(row) if row else None
+
+    async def fetch_all(self) -> List[dict]:
+        async with (await self._connect()).acquire() as conn:
+            rows = await conn.fetch(f"SELECT {self.COLUMNS} FROM prediction_log ORDER BY created_at")
+        return [self._to_record(row) for row in rows]
+
+    @staticmethod
+    def _to_record(row) -> dict:
+        return {
+            "prediction_id": str(row["prediction_id"]),
+            "kind": row["kind"],
+            "model_version": row["model_version"],
+            "request": json.loads(row["request"]),
+            "response": json.loads(row["response"]),
+            "created_at": row["created_at"].isoformat(),
+        }
+
+
+class PredictionLog:
+    """Ring buffer of prediction records flushed in batches by a background task.
+
+    ``record`` never blocks: when the buffer is full the oldest unflushed
+    record is dropped and counted rather than stalling the request.
+    """
+
+    def __init__(self, sink, capacity: int = 10000, batch_size: int = 500, flush_interval: float = 1.0):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.epoch = uuid.uuid4().hex[:8]
+        self._buffer: deque = deque(maxlen=capacity)
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self.metrics = {"recorded": 0, "flushed": 0, "dropped": 0, "flush_errors": 0}
+
+    @property
+    def version(self) -> str:
+        """Changes whenever a batch is persisted; used to key exports."""
+        return f"{self.epoch}:{self.metrics['flushed']}"
+
+    def record(self, kind: str, request: dict, response: dict):
+        """Enqueue a prediction for persistence. Hot path: O(1), no I/O."""
+        if len(self._buffer) == self._buffer.maxlen:
+            self.metrics["dropped"] += 1
+        self._buffer.append((kind, request, response))
+        self.metrics["recorded"] += 1
+
+    async def start(self):
+        try:
+            await self.sink.start()
+        except Exception:
+            # Serving must not depend on the audit log: keep buffering, and let
+            # each flush retry the sink (overflow is counted as dropped)
+            logger.exception("Prediction log sink unavailable at startup; buffering until it recovers")
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        # Let an in-flight flush finish instead of cancelling it mid-write
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+        while self._buffer:
+            if not await self.flush():
+                break
+        await self.sink.close()
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            while self._buffer and not self._stopping.is_set():
+                if not await self.flush():
+                    break
+
+    async def flush(self) -> bool:
+        """Write one batch to the sink; failed batches are re-queued."""
+        batch = []
+        while self._buffer and len(batch) < self.batch_size:
+            batch.append(self._buffer.popleft())
+        if not batch:
+            return True
+        records = [self._to_record(*item) for item in batch]
+        try:
+            await self.sink.write(records)
+        except asyncio.CancelledError:
+            self._requeue(batch)
+            raise
+        except Exception:
+            self.metrics["flush_errors"] += 1
+            logger.exception("Failed to flush %d prediction log records", len(batch))
+            self._requeue(batch)
+            return False
+        self.metrics["flushed"] += len(batch)
+        return True
+
+    def _requeue(self, batch: list):
+        """Put an unwritten batch back at the head of the buffer."""
+        # Records that arrived meanwhile keep their place; the batch is older,
+        # so any part of it that no longer fits is dropped first
+        room = self._buffer.maxlen - len(self._buffer)
+        requeue = batch[len(batch) - room:] if room > 0 else []
+        self.metrics["dropped"] += len(batch) - len(requeue)
+        self._buffer.extendleft(reversed(requeue))
+
+    @staticmethod
+    def _to_record(kind: str, request: dict, response: dict) -> dict:
+        return {
+            "prediction_id": response["prediction_id"],
+            "kind": kind,
+            "model_version": response.get("model_version"),
+            "request": request,
+            "response": response,
+            "created_at": response["created_at"],
+        }
+
+    async def get(self, prediction_id: str) -> Optional[dict]:
+        """Look up a prediction, including ones still waiting to be flushed."""
+        for kind, request, response in list(self._buffer):
+            if response["prediction_id"] == prediction_id:
+                return self._to_record(kind, request, response)
+        return await self.sink.get(prediction_id)
+
+    async def fetch_all(self) -> List[dict]:
+        return await self.sink.fetch_all()
+
+    def snapshot(self) -> dict:
+        return {**self.metrics, "pending": len(self._buffer), "backend": PREDICTION_LOG_BACKEND}
+
+
+def _make_sink():
+    if PREDICTION_LOG_BACKEND == "postgres":
+        return PostgresSink(DATABASE_URL)
+    return FileSink(PREDICTION_LOG_PATH)
+
+
+prediction_log = PredictionLog(_make_sink())
+
+
+def get_prediction_log() -> PredictionLog:
+    return prediction_log
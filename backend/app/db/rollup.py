@@ -0,0 +1,139 @@
+"""Hierarchical roll-ups of surveillance observations.
+
+Site observations are aggregated up the hierarchy site -> admin-1 -> country
+-> region -> all. Additive partials (catchment cases, case-weighted efficacy,
+artemisinin resistance and marker prevalence) are materialized per node and year, with
+cumulative sums along the year axis, so any node/time-window query is a
+single prefix-sum difference rather than a rescan of the observations.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.db.mock_data import get_countries, get_region_data, get_sites
+from app.db.timeseries import get_store, SITES
+
+LEVELS = ("site", "admin1", "country", "region", "all")
+ROOT = "all"
+
+# Fixed metric columns; each marker then adds (prevalence * cases, cases)
+CASES, EFFICACY_W, RESISTANCE_W = 0, 1, 2
+BASE_METRICS = 3
+
+
+class RollupCube:
+    """Materialized per-node, per-year partials with prefix sums over years."""
+
+    def __init__(self, sites: List[dict], countries: List[dict], regions: List[dict], observations: List[dict]):
+        self.years = sorted({o["year"] for o in observations})
+        self.markers = sorted({m for o in observations for m in o["markers"]})
+        self._marker_col = {m: BASE_METRICS + 2 * i for i, m in enumerate(self.markers)}
+        n_metrics = BASE_METRICS + 2 * len(self.markers)
+
+        countries_by_id = {c["id"]: c for c in countries}
+        region_names = {r["id"]: r["name"] for r in regions}
+        self.nodes: Dict[str, Dict[str, dict]] = {level: {} for level in LEVELS}
+        self._paths: Dict[str, List[str]] = {}
+        for site in sites:
+            country = countries_by_id[site["country_id"]]
+            admin1_id = f"{country['id']}/{site['admin1']}"
+            path = [site["id"], admin1_id, country["id"], country["region"], ROOT]
+            names = [site["name"], site["admin1"], country["name"], region_names.get(country["region"], country["region"]), "All regions"]
+            for i, (level, node_id) in enumerate(zip(LEVELS, path)):
+                node = self.nodes[level].setdefault(node_id, {
+                    "name": names[i],
+                    "parent": path[i + 1] if i + 1 < len(path) else None,
+                    "index": len(self.nodes[level]),
+                    "sites": 0,
+                })
+                node["sites"] += 1
+            self._paths[site["id"]] = path
+
+        year_index = {y: i for i, y in enumerate(self.years)}
+        self._partials = {
+            level: np.zeros((len(self.nodes[level]), len(self.years), n_metrics))
+            for level in LEVELS
+        }
+        for obs in observations:
+            row = np.zeros(n_metrics)
+            cases = obs["cases"]
+            row[CASES] = cases
+            row[EFFICACY_W] = cases * obs["efficacy"]
+            row[RESISTANCE_W] = cases * obs["resistance"]
+            for marker, prevalence in obs["markers"].items():
+                col = self._marker_col[marker]
+                row[col] = cases * prevalence
+                row[col + 1] = cases
+            y = year_index[obs["year"]]
+            for level, node_id in zip(LEVELS, self._paths[obs["site_id"]]):
+                self._partials[level][self.nodes[level][node_id]["index"], y] += row
+        self._prefix = {level: np.cumsum(p, axis=1) for level, p in self._partials.items()}
+
+    def _window(self, year_start: Optional[int], year_end: Optional[int]):
+        lo = bisect_left(self.years, year_start) if year_start is not None else 0
+        hi = (bisect_right(self.years, year_end) if year_end is not None else len(self.years)) - 1
+        return lo, hi
+
+    def _sums(self, level: str, index: int, lo: int, hi: int) -> np.ndarray:
+        prefix = self._prefix[level][index]
+        if hi < lo:
+            return np.zeros(prefix.shape[-1])
+        return prefix[hi] - prefix[lo - 1] if lo > 0 else prefix[hi].copy()
+
+    def _summarize(self, sums: np.ndarray) -> dict:
+        cases = sums[CASES]
+        prevalence = {}
+        for marker, col in self._marker_col.items():
+            if sums[col + 1]:
+                prevalence[marker] = round(float(sums[col] / sums[col + 1]), 2)
+        return {
+            "catchmentCases": int(cases),
+            "avgEfficacy": round(float(sums[EFFICACY_W] / cases), 2) if cases else None,
+            "avgResistance": round(float(sums[RESISTANCE_W] / cases), 2) if cases else None,
+            "markerPrevalence": prevalence,
+        }
+
+    def query(self, level: str, node_id: str, year_start: Optional[int] = None, year_end: Optional[int] = None) -> Optional[dict]:
+        """Case-weighted aggregates for one node over an inclusive year window."""
+        node = self.nodes[level].get(node_id)
+        if node is None:
+            return None
+        lo, hi = self._window(year_start, year_end)
+        return {
+            "level": level,
+            "id": node_id,
+            "name": node["name"],
+            "parent": node["parent"],
+            "surveillanceSites": node["sites"],
+            "yearStart": self.years[lo] if lo <= hi else year_start,
+            "yearEnd": self.years[hi] if lo <= hi else year_end,
+            **self._summarize(self._sums(level, node["index"], lo, hi)),
+        }
+
+    def query_level(self, level: str, year_start: Optional[int] = None, year_end: Optional[int] = None,
+                    parent: Optional[str] = None) -> List[dict]:
+        """Aggregates for every node at ``level``, optionally under one parent."""
+        return [
+            self.query(level, node_id, year_start, year_end)
+            for node_id, node in self.nodes[level].items()
+            if parent is None or node["parent"] == parent
+        ]
+
+    def series(self, level: str, node_id: str, year_start: Optional[int] = None, year_end: Optional[int] = None) -> List[dict]:
+        """Per-year aggregates for one node, read from the materialized partials."""
+        node = self.nodes[level].get(node_id)
+        if node is None:
+            return []
+        lo, hi = self._window(year_start, year_end)
+        return [
+            {"year": self.years[y], **self._summarize(self._partials[level][node["index"], y])}
+            for y in range(lo, hi + 1)
+        ]
+
+
+rollup = RollupCube(get_sites(), get_countries(), get_region_data(), list(get_store(SITES).scan()))
+
+
+def get_rollup() -> RollupCube:
+    return rollup
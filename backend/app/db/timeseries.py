@@ -0,0 +1,61 @@
+"""Time-partitioned observation store.
+
+Observations are bucketed into one partition per year, and range queries
+visit only the partitions inside the requested window. A query over a few
+years costs the same however many decades of history are stored.
+"""
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from app.db.mock_data import get_drug_efficacy_observations, get_marker_observations, get_site_observations
+
+SITES = "sites"
+MARKERS = "markers"
+DRUG_EFFICACY = "drug_efficacy"
+
+
+class PartitionedStore:
+    """Append-only records partitioned by their ``year`` field."""
+
+    def __init__(self, records: Iterable[dict] = ()):
+        self._partitions: Dict[int, List[dict]] = {}
+        self._keys: List[int] = []
+        for record in records:
+            self.insert(record)
+
+    def insert(self, record: dict):
+        year = record["year"]
+        partition = self._partitions.get(year)
+        if partition is None:
+            partition = self._partitions[year] = []
+            insort(self._keys, year)
+        partition.append(record)
+
+    @property
+    def years(self) -> List[int]:
+        return list(self._keys)
+
+    def partitions(self, year_start: Optional[int] = None, year_end: Optional[int] = None) -> List[int]:
+        """Partition keys overlapping the inclusive window, without touching the rest."""
+        lo = bisect_left(self._keys, year_start) if year_start is not None else 0
+        hi = bisect_right(self._keys, year_end) if year_end is not None else len(self._keys)
+        return self._keys[lo:hi]
+
+    def scan(self, year_start: Optional[int] = None, year_end: Optional[int] = None,
+             where: Optional[Callable[[dict], bool]] = None) -> Iterator[dict]:
+        """Yield records in year order from the partitions inside the window."""
+        for year in self.partitions(year_start, year_end):
+            for record in self._partitions[year]:
+                if where is None or where(record):
+                    yield record
+
+
+_stores = {
+    SITES: PartitionedStore(get_site_observations()),
+    MARKERS: PartitionedStore(get_marker_observations()),
+    DRUG_EFFICACY: PartitionedStore(get_drug_efficacy_observations()),
+}
+
+
+def get_store(name: str) -> PartitionedStore:
+    return _stores[name]
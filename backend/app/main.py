@@ -6,15 +6,19 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
+from app.db.prediction_log import get_prediction_log
+
 # Import routers from api/v1
-from app.api.v1 import health, reports, drugs, markers, dashboard, predictions, gis
+from app.api.v1 import health, reports, drugs, markers, dashboard, predictions, gis, sync, export
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     print("🚀 Starting Malaria Drug Resistance Platform API...")
+    await get_prediction_log().start()
     yield
+    await get_prediction_log().stop()
     print("👋 Shutting down API...")
 
 
@@ -47,6 +51,8 @@ app.include_router(markers.router, prefix="/api/v1", tags=["Markers"])
 app.include_router(dashboard.router, prefix="/api/v1", tags=["Dashboard"])
 app.include_router(predictions.router, prefix="/api/v1", tags=["Predictions"])
 app.include_router(gis.router, prefix="/api/v1", tags=["GIS"])
+app.include_router(sync.router, prefix="/api/v1", tags=["Sync"])
+app.include_router(export.router, prefix="/api/v1", tags=["Export"])
 
 
 @app.get("/")
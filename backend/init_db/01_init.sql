@@ -33,10 +33,20 @@ CREATE TABLE IF NOT EXISTS molecular_markers (
     created_at TIMESTAMP DEFAULT NOW()
 );
 
+CREATE TABLE IF NOT EXISTS prediction_log (
+    prediction_id UUID PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL,
+    model_version VARCHAR(50),
+    request JSONB NOT NULL,
+    response JSONB NOT NULL,
+    created_at TIMESTAMP NOT NULL
+);
+
 -- Add indexes
 CREATE INDEX IF NOT EXISTS idx_reports_country ON resistance_reports(country_id);
 CREATE INDEX IF NOT EXISTS idx_reports_date ON resistance_reports(report_date);
 CREATE INDEX IF NOT EXISTS idx_countries_region ON countries(region);
+CREATE INDEX IF NOT EXISTS idx_prediction_log_created ON prediction_log(created_at);
 
 -- Placeholder message
 DO $$